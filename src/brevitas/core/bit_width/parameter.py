@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 
-from typing import Optional
+from typing import Optional, Tuple
 
 import torch
 from torch import Tensor
@@ -10,7 +10,7 @@ from torch.nn import Parameter, Module
 
 import brevitas
 import brevitas.config as config
-from brevitas.function import abs_binary_sign_grad
+from brevitas.function import abs_binary_sign_grad, abs_add_round_ste
 from brevitas.core.function_wrapper import RoundSte
 from brevitas.core.restrict_val import IntRestrictValue
 
@@ -18,6 +18,114 @@ from brevitas.core.restrict_val import IntRestrictValue
 MIN_INT_BIT_WIDTH = 2
 NON_ZERO_EPSILON = 1e-6
 REMOVE_ZERO_BIT_WIDTH = 0.1
+OFFSET_ATTR_NAME = 'bit_width_offset'
+BASE_ATTR_NAME = 'bit_width_base'
+COEFF_ATTR_NAME = 'bit_width_coeff'
+EPSILON_ATTR_NAME = 'non_zero_epsilon'
+
+# Stateless, so a single instance can be shared by all learned bit-widths
+DEFAULT_INT_RESTRICT = IntRestrictValue(RoundSte())
+
+
+def _is_cacheable(module: Module) -> bool:
+    """
+    The output of a learned bit-width module is cached only when it can't be differentiated
+    through, i.e. in eval mode and with gradients disabled, and outside of tracing, so that
+    export still records the computation.
+    """
+    return (
+        not module.training
+        and not torch.is_grad_enabled()
+        and not torch._C._get_tracing_state())
+
+
+def _cache_key(param: Tensor) -> Tuple[Tensor, int, int]:
+    """
+    Identify the current value of a Parameter. The version counter is bumped by in-place updates
+    (optimizer.step(), load_state_dict(), etc.), but not by .data assignment or by replacing the
+    Parameter (e.g. vector_to_parameters()), which swap the underlying storage instead. The
+    detached alias keeps that storage alive, so that its address can't be reused by a later swap.
+    """
+    return param.detach(), param.data_ptr(), param._version
+
+
+def _is_stale(key: Optional[Tuple[Tensor, int, int]], param: Tensor) -> bool:
+    return key is None or key[1] != param.data_ptr() or key[2] != param._version
+
+
+def _detached_to(bit_width: Tensor, device: torch.device) -> Tensor:
+    bit_width = bit_width.detach()
+    if bit_width.device.type == 'cpu' and torch.device(device).type == 'cuda':
+        # a non blocking host to device copy requires page-locked memory
+        bit_width = bit_width.pin_memory()
+    return bit_width.to(device, non_blocking=True)
+
+
+class _ParameterCache(object):
+    """
+    Values derived from a Parameter, dropped all together as soon as the Parameter changes, see
+    _cache_key(). Nothing is cached when compiled with BREVITAS_JIT=1, since attributes of a
+    compiled module are copied on every access.
+    """
+
+    def __init__(self):
+        self.key = None
+        self.values = {}
+
+    def get(self, param: Tensor, name, compute):
+        if config.JIT_ENABLED:
+            return compute()
+        if _is_stale(self.key, param):
+            self.key = _cache_key(param)
+            self.values = {}
+        if name not in self.values:
+            self.values[name] = compute()
+        return self.values[name]
+
+    def output(self, param: Tensor, compute):
+        """
+        Output of compute() with gradients disabled
+        """
+        with torch.no_grad():
+            return self.get(param, 'output', compute)
+
+    def scalar(self, param: Tensor, compute):
+        """
+        Output of compute() with gradients disabled, as a Python float
+        """
+        return self.get(param, 'scalar', lambda: self.output(param, compute).item())
+
+    def detached_to(self, param: Tensor, compute, device: torch.device):
+        """
+        Output of compute() with gradients disabled, moved to device
+        """
+        device = torch.device(device)
+        return self.get(
+            param,
+            ('detached_to', device),
+            lambda: _detached_to(self.output(param, compute), device))
+
+
+def _remove_missing_key(missing_keys, key):
+    # a single scan of missing_keys, rather than one for the membership check plus one to remove
+    try:
+        missing_keys.remove(key)
+    except ValueError:
+        pass
+
+
+@brevitas.jit.script
+def _learned_bit_width(offset: Tensor, base: Tensor, use_sign_grad: bool) -> Tensor:
+    if use_sign_grad:
+        return abs_binary_sign_grad(offset) + base
+    else:
+        return torch.abs(offset) + base
+
+
+@brevitas.jit.script
+def _learned_bit_width_to_remove(coeff: Tensor, non_zero_epsilon: Tensor) -> Tensor:
+    bit_width_to_remove = torch.abs(coeff) + non_zero_epsilon
+    return bit_width_to_remove.reciprocal_()
 
 
 class BitWidthParameter(brevitas.jit.ScriptModule):
@@ -27,8 +135,12 @@ class BitWidthParameter(brevitas.jit.ScriptModule):
     Args:
         bit_width (int): value to initialize the output learned bit-width.
         min_bit_width (int): lower bound for the output learned bit-width. Default: 2.
-        restrict_bit_width_impl: restrict the learned bit-width to a subset of values. Default: IntRestrictValue(RoundSte()).
+        restrict_bit_width_impl: restrict the learned bit-width to a subset of values. Default: DEFAULT_INT_RESTRICT, a shared IntRestrictValue(RoundSte()).
         override_pretrained_bit_width (bool): ignore pretrained bit-width loaded from a state dict. Default: False.
+        use_sign_grad (bool): backpropagate through the absolute value of the learned offset with a
+            subgradient of 1 in 0, rather than :func:`torch.abs`' 0. Default: True.
+        dtype (torch.dtype): dtype of the learned offset and of the returned bit-width. Default: None.
+        device (torch.device): device of the learned offset and of the returned bit-width. Default: None.
 
     Returns:
         Tensor: bit-width wrapped in a float torch.tensor and backend by a learnable torch.nn.Parameter.
@@ -39,7 +151,7 @@ class BitWidthParameter(brevitas.jit.ScriptModule):
     Examples:
         >>> bit_width_parameter = BitWidthParameter(8)
         >>> bit_width_parameter()
-        tensor(8., grad_fn=<RoundSteFnBackward>)
+        tensor(8., grad_fn=<AbsAddRoundSteFnBackward>)
 
     Note:
         Set env variable BREVITAS_IGNORE_MISSING_KEYS=1 to avoid errors when retraining
@@ -48,14 +160,17 @@ class BitWidthParameter(brevitas.jit.ScriptModule):
     Note:
         Maps to bit_width_impl_type == BitWidthImplType.PARAMETER == 'PARAMETER' == 'parameter' in higher-level APIs.
     """
-    __constants__ = ['bit_width_base', 'override_pretrained']
+    __constants__ = ['override_pretrained', 'use_sign_grad', 'fused_round']
 
     def __init__(
             self,
             bit_width: int,
             min_bit_width: int = MIN_INT_BIT_WIDTH,
-            restrict_bit_width_impl: Module = IntRestrictValue(RoundSte()),
-            override_pretrained_bit_width: bool = False) -> None:
+            restrict_bit_width_impl: Module = DEFAULT_INT_RESTRICT,
+            override_pretrained_bit_width: bool = False,
+            use_sign_grad: bool = True,
+            dtype: Optional[torch.dtype] = None,
+            device: Optional[torch.device] = None) -> None:
         super(BitWidthParameter, self).__init__()
 
         if bit_width < MIN_INT_BIT_WIDTH:
@@ -72,40 +187,97 @@ class BitWidthParameter(brevitas.jit.ScriptModule):
 
         bit_width = float(int(bit_width))
         min_bit_width = float(int(min_bit_width))
-        bit_width_base = restrict_bit_width_impl.restrict_init_float(min_bit_width)
-        bit_width = restrict_bit_width_impl.restrict_init_float(bit_width)
+        if type(restrict_bit_width_impl) == IntRestrictValue:
+            # restrict_init_float is the identity on integer restrictions
+            bit_width_base = min_bit_width
+        else:
+            bit_width_base = restrict_bit_width_impl.restrict_init_float(min_bit_width)
+            bit_width = restrict_bit_width_impl.restrict_init_float(bit_width)
         bit_width_offset_init = bit_width - bit_width_base
-        self.bit_width_offset = Parameter(torch.tensor(bit_width_offset_init))
-        self.bit_width_base = bit_width_base
+        self.bit_width_offset = Parameter(
+            torch.tensor(bit_width_offset_init, dtype=dtype, device=device))
+        self.register_buffer(
+            BASE_ATTR_NAME, torch.tensor(bit_width_base, dtype=dtype, device=device))
         self.restrict_bit_width_impl = restrict_bit_width_impl
         self.override_pretrained = override_pretrained_bit_width
+        self.use_sign_grad = use_sign_grad
+        # abs, add and round can be computed by a single fused op with the default restriction
+        self.fused_round = (
+            use_sign_grad
+            and type(restrict_bit_width_impl) == IntRestrictValue
+            and type(restrict_bit_width_impl.float_to_int_impl) == RoundSte)
+        self._cache = _ParameterCache()
 
     @brevitas.jit.script_method
     def forward(self) -> Tensor:
-        bit_width = abs_binary_sign_grad(self.bit_width_offset) + self.bit_width_base
+        if not torch.jit.is_scripting():
+            if _is_cacheable(self):
+                return self._cache.output(self.bit_width_offset, self._bit_width)
+        return self._bit_width()
+
+    @brevitas.jit.script_method
+    def _bit_width(self) -> Tensor:
+        if not torch.jit.is_scripting():
+            if not torch.is_grad_enabled():
+                # Nothing to backpropagate to, skip the straight-through autograd functions
+                bit_width = torch.abs(self.bit_width_offset) + self.bit_width_base
+                if self.fused_round:
+                    return torch.round(bit_width)
+                return self.restrict_bit_width_impl(bit_width)
+        if self.fused_round:
+            return abs_add_round_ste(self.bit_width_offset, self.bit_width_base)
+        bit_width = _learned_bit_width(
+            self.bit_width_offset, self.bit_width_base, self.use_sign_grad)
         bit_width = self.restrict_bit_width_impl(bit_width)
         return bit_width
 
+    @brevitas.jit.script_method
+    def scalar(self) -> float:
+        """
+        Value of the output as a Python float, cached until the value of bit_width_offset
+        changes, so that it can be consumed by Tensor-Scalar kernels. It is never differentiable.
+        """
+        if not torch.jit.is_scripting():
+            return self._cache.scalar(self.bit_width_offset, self._bit_width)
+        return float(self._bit_width().item())
+
+    def detached_to(self, device: torch.device) -> Tensor:
+        """
+        Detached output moved to device without blocking the host, for inference callers
+        running on a different device than the one this module lives on. The copy is cached until
+        the value of bit_width_offset changes.
+        """
+        return self._cache.detached_to(self.bit_width_offset, self._bit_width, device)
+
     def _load_from_state_dict(self, state_dict, prefix, local_metadata, strict,
                               missing_keys, unexpected_keys, error_msgs):
-        bit_width_offset_key = prefix + 'bit_width_offset'
-        if self.override_pretrained and bit_width_offset_key in state_dict:
-            del state_dict[bit_width_offset_key]
+        bit_width_offset_key = prefix + OFFSET_ATTR_NAME
+        if self.override_pretrained:
+            state_dict.pop(bit_width_offset_key, None)
         super(BitWidthParameter, self)._load_from_state_dict(
             state_dict, prefix, local_metadata,strict,missing_keys, unexpected_keys, error_msgs)
-        if config.IGNORE_MISSING_KEYS and bit_width_offset_key in missing_keys:
-            missing_keys.remove(bit_width_offset_key)
+        if config.IGNORE_MISSING_KEYS:
+            _remove_missing_key(missing_keys, bit_width_offset_key)
+        _remove_missing_key(missing_keys, prefix + BASE_ATTR_NAME)
+
+    def state_dict(self, destination=None, prefix='', keep_vars=False):
+        output_dict = super(BitWidthParameter, self).state_dict(
+            destination=destination, prefix=prefix, keep_vars=keep_vars)
+        del output_dict[prefix + BASE_ATTR_NAME]
+        return output_dict
 
 
 class RemoveBitwidthParameter(brevitas.jit.ScriptModule):
-    __constants__ = ['non_zero_epsilon', 'override_pretrained']
+    __constants__ = ['override_pretrained']
 
     def __init__(
             self,
             bit_width_to_remove: int,
             override_pretrained_bit_width: bool = False,
             non_zero_epsilon: float = NON_ZERO_EPSILON,
-            remove_zero_bit_width = REMOVE_ZERO_BIT_WIDTH):
+            remove_zero_bit_width = REMOVE_ZERO_BIT_WIDTH,
+            dtype: Optional[torch.dtype] = None,
+            device: Optional[torch.device] = None):
         super(RemoveBitwidthParameter, self).__init__()
 
         if bit_width_to_remove < 0:
@@ -114,26 +286,55 @@ class RemoveBitwidthParameter(brevitas.jit.ScriptModule):
             bit_width_coeff_init = 1 / remove_zero_bit_width
         else:
             bit_width_coeff_init = 1 / bit_width_to_remove
-        self.bit_width_coeff = Parameter(torch.tensor(bit_width_coeff_init))
-        self.non_zero_epsilon = non_zero_epsilon
+        self.bit_width_coeff = Parameter(
+            torch.tensor(bit_width_coeff_init, dtype=dtype, device=device))
+        self.register_buffer(
+            EPSILON_ATTR_NAME, torch.tensor(non_zero_epsilon, dtype=dtype, device=device))
         self.override_pretrained = override_pretrained_bit_width
+        self._cache = _ParameterCache()
 
     @brevitas.jit.script_method
     def forward(self) -> Tensor:
-        bit_width_to_remove = 1.0 / (self.non_zero_epsilon + torch.abs(self.bit_width_coeff))
-        return bit_width_to_remove
+        if not torch.jit.is_scripting():
+            if _is_cacheable(self):
+                return self._cache.output(self.bit_width_coeff, self._bit_width_to_remove)
+        return self._bit_width_to_remove()
+
+    @brevitas.jit.script_method
+    def _bit_width_to_remove(self) -> Tensor:
+        return _learned_bit_width_to_remove(self.bit_width_coeff, self.non_zero_epsilon)
+
+    @brevitas.jit.script_method
+    def scalar(self) -> float:
+        """
+        Value of the output as a Python float, cached until the value of bit_width_coeff
+        changes, so that it can be consumed by Tensor-Scalar kernels. It is never differentiable.
+        """
+        if not torch.jit.is_scripting():
+            return self._cache.scalar(self.bit_width_coeff, self._bit_width_to_remove)
+        return float(self._bit_width_to_remove().item())
+
+    def detached_to(self, device: torch.device) -> Tensor:
+        """
+        Detached output moved to device without blocking the host, for inference callers
+        running on a different device than the one this module lives on. The copy is cached until
+        the value of bit_width_coeff changes.
+        """
+        return self._cache.detached_to(self.bit_width_coeff, self._bit_width_to_remove, device)
 
     def _load_from_state_dict(self, state_dict, prefix, local_metadata, strict,
                               missing_keys, unexpected_keys, error_msgs):
-        bit_width_coeff_key = prefix + 'bit_width_coeff'
-        if self.override_pretrained and bit_width_coeff_key in state_dict:
-            del state_dict[bit_width_coeff_key]
+        bit_width_coeff_key = prefix + COEFF_ATTR_NAME
+        if self.override_pretrained:
+            state_dict.pop(bit_width_coeff_key, None)
         super(RemoveBitwidthParameter, self)._load_from_state_dict(
             state_dict, prefix, local_metadata, strict, missing_keys, unexpected_keys, error_msgs)
-        if config.IGNORE_MISSING_KEYS and bit_width_coeff_key in missing_keys:
-            missing_keys.remove(bit_width_coeff_key)
-
-
-
-
-
+        if config.IGNORE_MISSING_KEYS:
+            _remove_missing_key(missing_keys, bit_width_coeff_key)
+        _remove_missing_key(missing_keys, prefix + EPSILON_ATTR_NAME)
+
+    def state_dict(self, destination=None, prefix='', keep_vars=False):
+        output_dict = super(RemoveBitwidthParameter, self).state_dict(
+            destination=destination, prefix=prefix, keep_vars=keep_vars)
+        del output_dict[prefix + EPSILON_ATTR_NAME]
+        return output_dict
@@ -194,6 +194,21 @@ class AbsBinarySignGradFn : public torch::autograd::Function<AbsBinarySignGradFn
 };
 
 
+class AbsAddRoundSteFn : public torch::autograd::Function<AbsAddRoundSteFn> {
+ public:
+
+  static Tensor forward(AutogradContext* ctx, Tensor input, Tensor other) {
+    ctx->save_for_backward({input});
+    return at::round(at::abs(input) + other);
+  };
+
+  static tensor_list backward(AutogradContext* ctx, tensor_list grad_output) {
+    Tensor input = ctx->get_saved_variables()[0];
+    return {BinarySignSteFn::apply(input) * grad_output[0], Tensor()};
+  }
+};
+
+
 Tensor ceil_ste_impl(const Tensor& input) {
  return CeilSteFn::apply(input);
 };
@@ -254,6 +269,11 @@ Tensor abs_binary_sign_grad_impl(const Tensor& input) {
 };
 
 
+Tensor abs_add_round_ste_impl(const Tensor& input, const Tensor& other) {
+ return AbsAddRoundSteFn::apply(input, other);
+};
+
+
 
 TORCH_LIBRARY(autograd_ste_ops, m) {
     m.def("round_ste_impl", &round_ste_impl);
@@ -268,5 +288,6 @@ TORCH_LIBRARY(autograd_ste_ops, m) {
     m.def("round_to_zero_ste_impl", &round_to_zero_ste_impl);
     m.def("dpu_round_ste_impl", &dpu_round_ste_impl);
     m.def("abs_binary_sign_grad_impl", &abs_binary_sign_grad_impl);
+    m.def("abs_add_round_ste_impl", &abs_add_round_ste_impl);
 }
     
\ No newline at end of file
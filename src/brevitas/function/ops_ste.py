@@ -31,7 +31,8 @@ __all__ = [
     'ternary_sign_ste',
     'round_to_zero_ste',
     'dpu_round_ste',
-    'abs_binary_sign_grad'
+    'abs_binary_sign_grad',
+    'abs_add_round_ste'
 ]
 
 
@@ -367,4 +368,32 @@ def abs_binary_sign_grad(x: Tensor) -> Tensor:
     """
     if torch._C._get_tracing_state():
         return torch.abs(x)
-    return fn_prefix.ops.autograd_ste_ops.abs_binary_sign_grad_impl(x)
\ No newline at end of file
+    return fn_prefix.ops.autograd_ste_ops.abs_binary_sign_grad_impl(x)
+
+
+@script_flag
+def abs_add_round_ste(x: Tensor, y: Tensor) -> Tensor:
+    """
+    Function that implements ``torch.round(torch.abs(x) + y)`` with a straight-through gradient
+    estimator for the rounding and a binary-sign backward for the absolute value, i.e. the
+    fusion of :func:`~brevitas.function.ops_ste.abs_binary_sign_grad`, an add and
+    :func:`~brevitas.function.ops_ste.round_ste`. The gradient w.r.t. y is always None.
+
+    Notes:
+        Wrapper for either :func:`~brevitas.ops.autograd_ste_ops.abs_add_round_ste_impl`
+        (with env ``BREVITAS_JIT=0``) or its native just-in-time compiled variant (with
+        ``BREVITAS_JIT=1``).
+
+    Examples:
+        >>> x = torch.tensor([0.0, -1.7], requires_grad=True)
+        >>> y = abs_add_round_ste(x, torch.tensor(2.0))
+        >>> y
+        tensor([2., 4.], grad_fn=<AbsAddRoundSteFnBackward>)
+        >>> grad = torch.tensor([0.1, 0.1])
+        >>> y.backward(grad)
+        >>> x.grad
+        tensor([ 0.1000, -0.1000])
+    """
+    if torch._C._get_tracing_state():
+        return torch.round(torch.abs(x) + y)
+    return fn_prefix.ops.autograd_ste_ops.abs_add_round_ste_impl(x, y)
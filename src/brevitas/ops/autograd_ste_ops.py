@@ -26,6 +26,7 @@ __all__ = [
     'TernarySignSteFn',
     'RoundSteFn',
     'AbsBinarySignGradFn',
+    'AbsAddRoundSteFn',
     'DPURoundSteFn',
     'round_ste_impl',
     'binary_sign_ste_impl',
@@ -37,6 +38,7 @@ __all__ = [
     'scalar_clamp_ste_impl',
     'tensor_clamp_ste_impl',
     'abs_binary_sign_grad_impl',
+    'abs_add_round_ste_impl',
     'dpu_round_ste_impl'
 ]
 
@@ -382,6 +384,39 @@ class AbsBinarySignGradFn(Function):
         return y
 
 
+class AbsAddRoundSteFn(Function):
+    """
+    Autograd function that implements ``torch.round(torch.abs(x) + y)`` with a straight-through
+    gradient estimator for the rounding and a binary-sign backward for the absolute value, while
+    the gradient w.r.t. y is always None. It fuses :class:`AbsBinarySignGradFn`, an add and
+    :class:`RoundSteFn` into a single autograd node.
+
+    ``AbsAddRoundSteFn.apply(*args)`` is first aliased to :func:`abs_add_round_ste_impl(*args)
+    <brevitas.ops.autograd_ste_ops.abs_add_round_ste_impl>` and then wrapped by
+    :func:`~brevitas.function.ops_ste.abs_add_round_ste` when env ``BREVITAS_JIT=0``.
+    See :func:`~brevitas.function.ops_ste.abs_add_round_ste` for details on the interface and
+    examples.
+    """
+
+    @staticmethod
+    def forward(ctx, x: Tensor, y: Tensor) -> Tensor:
+        ctx.save_for_backward(binary_sign(x).type(torch.int8))  # save some memory
+        z = torch.round(torch.abs(x) + y)
+        return z
+
+    @staticmethod
+    def backward(ctx, grad_z: Tensor) -> Tuple[Tensor, None]:
+        binary_sign, = ctx.saved_tensors
+        return binary_sign.type_as(grad_z) * grad_z, None
+
+    @staticmethod
+    def symbolic(g, x: Tensor, y: Tensor):
+        z = g.op('Abs', x)
+        z = g.op('Add', z, y)
+        z = g.op('Round', z)
+        return z
+
+
 #: Alias for :class:`RoundSteFn.apply(*args)
 #: <brevitas.ops.autograd_ste_ops.RoundSteFn>`
 round_ste_impl = RoundSteFn.apply
@@ -429,3 +464,7 @@ tensor_clamp_ste_impl_ = InplaceTensorClampSteFn.apply
 #: Alias for :class:`AbsBinarySignGradFn.apply(*args)
 #: <brevitas.ops.autograd_ste_ops.AbsBinarySignGradFn>`
 abs_binary_sign_grad_impl = AbsBinarySignGradFn.apply
+
+#: Alias for :class:`AbsAddRoundSteFn.apply(*args)
+#: <brevitas.ops.autograd_ste_ops.AbsAddRoundSteFn>`
+abs_add_round_ste_impl = AbsAddRoundSteFn.apply
@@ -3,12 +3,17 @@
 
 
 import logging
+from logging.handlers import MemoryHandler
 import sys
 import os
 
+import numpy as np
+import torch
 
-class AverageMeter(object):
+
+class AverageMeter:
     """Computes and stores the average and current value"""
+    __slots__ = ('val', 'avg', 'sum', 'count')
 
     def __init__(self):
         self.reset()
@@ -25,73 +30,195 @@ class AverageMeter(object):
         self.count += n
         self.avg = self.sum / self.count
 
+    def update_batch(self, vals, ns):
+        """Accumulates a sequence of values, each averaged over the corresponding n, at once"""
+        vals = np.asarray(vals, dtype=np.float64)
+        ns = np.asarray(ns)
+        if vals.size == 0:
+            return
+        self.val = float(vals[-1])
+        self.sum += float(np.dot(vals, ns))
+        self.count += int(ns.sum())
+        self.avg = self.sum / self.count
+
+
+class IntAccuracyMeter:
+    """
+    Accumulates correct predictions as an int64 tensor on their own device, so that updates
+    don't sync with the host. Accuracies (%) are materialized only when val or avg are read,
+    or by read_accuracies() for several meters at once.
+    """
+    __slots__ = ('correct', 'count', 'last_correct', 'last_count')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.correct = 0
+        self.count = 0
+        self.last_correct = 0
+        self.last_count = 0
+
+    def update(self, correct, n):
+        correct = correct.sum()
+        self.correct = self.correct + correct
+        self.count += n
+        self.last_correct = correct
+        self.last_count = n
+
+    @property
+    def val(self):
+        if self.last_count == 0:
+            return 0.
+        return 100. * float(self.last_correct) / self.last_count
+
+    @property
+    def avg(self):
+        if self.count == 0:
+            return 0.
+        return 100. * float(self.correct) / self.count
+
+
+def read_accuracies(*meters):
+    """
+    Returns val and avg of each IntAccuracyMeter, in order, reading back all the correct counts
+    with a single device to host transfer rather than one per property access
+    """
+    corrects = [c for meter in meters for c in (meter.last_correct, meter.correct)]
+    counts = [n for meter in meters for n in (meter.last_count, meter.count)]
+    # meters that haven't been updated yet still hold python ints
+    tensors = [c for c in corrects if torch.is_tensor(c)]
+    read_back = iter(torch.stack(tensors).tolist() if tensors else [])
+    corrects = [next(read_back) if torch.is_tensor(c) else c for c in corrects]
+    return [100. * c / n if n else 0. for c, n in zip(corrects, counts)]
+
+
+class TrainingEpochMeters:
+    __slots__ = ('batch_time', 'data_time', 'losses', 'top1', 'top5')
 
-class TrainingEpochMeters(object):
     def __init__(self):
         self.batch_time = AverageMeter()
         self.data_time = AverageMeter()
         self.losses = AverageMeter()
-        self.top1 = AverageMeter()
-        self.top5 = AverageMeter()
+        self.top1 = IntAccuracyMeter()
+        self.top5 = IntAccuracyMeter()
+
 
+class EvalEpochMeters:
+    __slots__ = ('model_time', 'loss_time', 'losses', 'top1', 'top5')
 
-class EvalEpochMeters(object):
     def __init__(self):
         self.model_time = AverageMeter()
         self.loss_time = AverageMeter()
         self.losses = AverageMeter()
-        self.top1 = AverageMeter()
-        self.top5 = AverageMeter()
+        self.top1 = IntAccuracyMeter()
+        self.top5 = IntAccuracyMeter()
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """Appends records to a file opened in binary mode with a large write buffer"""
+
+    def __init__(self, filename, buffering=65536, delay=False):
+        self.buffering = buffering
+        super(BufferedFileHandler, self).__init__(filename, mode='ab', delay=delay)
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffering)
+
+    def emit(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record).encode('utf-8') + b'\n')
+        except Exception:
+            self.handleError(record)
 
 
 class Logger(object):
 
     def __init__(self, output_dir_path, dry_run):
         self.output_dir_path = output_dir_path
+        self.file_hdlr = None
+        self.mem_hdlr = None
+        self._eval_fmt = (
+            'Test: [%d/%d]\t'
+            'Model Time %.3f (%.3f)\t'
+            'Loss Time %.3f (%.3f)\t'
+            'Loss %.4f (%.4f)\t'
+            'Prec@1 %.3f (%.3f)\t'
+            'Prec@5 %.3f (%.3f)\t')
+        self._train_fmt = (
+            'Epoch: [%d][%d/%d]\t'
+            'Time %.3f (%.3f)\t'
+            'Data %.3f (%.3f)\t'
+            'Loss %.4f (%.4f)\t'
+            'Prec@1 %.3f (%.3f)\t'
+            'Prec@5 %.3f (%.3f)\t')
         self.log = logging.getLogger('log')
         self.log.setLevel(logging.INFO)
 
+        # Skip collecting thread and process info on every record, they are never printed
+        logging.logThreads = False
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
+        # An explicit datefmt avoids formatting milliseconds on every record
+        formatter = logging.Formatter('%(asctime)s %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+
         # Stout logging
         out_hdlr = logging.StreamHandler(sys.stdout)
-        out_hdlr.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        out_hdlr.setFormatter(formatter)
         out_hdlr.setLevel(logging.INFO)
         self.log.addHandler(out_hdlr)
 
         # Txt logging
         if not dry_run:
-            file_hdlr = logging.FileHandler(os.path.join(self.output_dir_path, 'log.txt'))
-            file_hdlr.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
-            file_hdlr.setLevel(logging.INFO)
-            self.log.addHandler(file_hdlr)
+            self.file_hdlr = BufferedFileHandler(os.path.join(self.output_dir_path, 'log.txt'))
+            self.file_hdlr.setFormatter(formatter)
+            self.file_hdlr.setLevel(logging.INFO)
+            # Buffer records in memory and write them out in bulk, see flush()
+            self.mem_hdlr = MemoryHandler(
+                capacity=1024, flushLevel=logging.WARNING, target=self.file_hdlr)
+            self.log.addHandler(self.mem_hdlr)
             self.log.propagate = False
 
-    def info(self, arg):
-        self.log.info(arg)
+    def flush(self):
+        if self.mem_hdlr is not None:
+            self.mem_hdlr.flush()
+            self.file_hdlr.flush()
+
+    def info(self, msg, *args):
+        self.log.info(msg, *args)
 
     def eval_batch_cli_log(self, epoch_meters, batch, tot_batches):
-        self.info('Test: [{0}/{1}]\t'
-                  'Model Time {model_time.val:.3f} ({model_time.avg:.3f})\t'
-                  'Loss Time {loss_time.val:.3f} ({loss_time.avg:.3f})\t'
-                  'Loss {loss.val:.4f} ({loss.avg:.4f})\t'
-                  'Prec@1 {top1.val:.3f} ({top1.avg:.3f})\t'
-                  'Prec@5 {top5.val:.3f} ({top5.avg:.3f})\t'
-                  .format(batch, tot_batches,
-                          model_time=epoch_meters.model_time,
-                          loss_time=epoch_meters.loss_time,
-                          loss=epoch_meters.losses,
-                          top1=epoch_meters.top1,
-                          top5=epoch_meters.top5))
+        if not self.log.isEnabledFor(logging.INFO):
+            return
+        model_time = epoch_meters.model_time
+        loss_time = epoch_meters.loss_time
+        loss = epoch_meters.losses
+        top1_val, top1_avg, top5_val, top5_avg = read_accuracies(
+            epoch_meters.top1, epoch_meters.top5)
+        self.log.info(
+            self._eval_fmt,
+            batch, tot_batches,
+            model_time.val, model_time.avg,
+            loss_time.val, loss_time.avg,
+            loss.val, loss.avg,
+            top1_val, top1_avg,
+            top5_val, top5_avg)
 
     def training_batch_cli_log(self, epoch_meters, epoch, batch, tot_batches):
-        self.info('Epoch: [{0}][{1}/{2}]\t'
-                         'Time {batch_time.val:.3f} ({batch_time.avg:.3f})\t'
-                         'Data {data_time.val:.3f} ({data_time.avg:.3f})\t'
-                         'Loss {loss.val:.4f} ({loss.avg:.4f})\t'
-                         'Prec@1 {top1.val:.3f} ({top1.avg:.3f})\t'
-                         'Prec@5 {top5.val:.3f} ({top5.avg:.3f})\t'
-                         .format(epoch, batch, tot_batches,
-                                 batch_time=epoch_meters.batch_time,
-                                 data_time=epoch_meters.data_time,
-                                 loss=epoch_meters.losses,
-                                 top1=epoch_meters.top1,
-                                 top5=epoch_meters.top5))
+        if not self.log.isEnabledFor(logging.INFO):
+            return
+        batch_time = epoch_meters.batch_time
+        data_time = epoch_meters.data_time
+        loss = epoch_meters.losses
+        top1_val, top1_avg, top5_val, top5_avg = read_accuracies(
+            epoch_meters.top1, epoch_meters.top5)
+        self.log.info(
+            self._train_fmt,
+            epoch, batch, tot_batches,
+            batch_time.val, batch_time.avg,
+            data_time.val, data_time.avg,
+            loss.val, loss.avg,
+            top1_val, top1_avg,
+            top5_val, top5_avg)
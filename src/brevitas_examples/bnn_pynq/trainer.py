@@ -38,10 +38,9 @@ class MirrorMNIST(MNIST):
         ]
 
 
-def accuracy(output, target, topk=(1,)):
-    """Computes the precision@k for the specified values of k"""
+def correct_topk(output, target, topk=(1,)):
+    """Computes the number of correct top-k predictions for the specified values of k"""
     maxk = max(topk)
-    batch_size = target.size(0)
 
     _, pred = output.topk(maxk, 1, True, True)
     pred = pred.t()
@@ -49,8 +48,7 @@ def accuracy(output, target, topk=(1,)):
 
     res = []
     for k in topk:
-        correct_k = correct[:k].flatten().float().sum(0)
-        res.append(correct_k.mul_(100.0 / batch_size))
+        res.append(correct[:k].flatten().sum(0))
     return res
 
 
@@ -189,7 +187,7 @@ class Trainer(object):
 
     def checkpoint_best(self, epoch, name):
         best_path = os.path.join(self.checkpoints_dir_path, name)
-        self.logger.info("Saving checkpoint model to {}".format(best_path))
+        self.logger.info("Saving checkpoint model to %s", best_path)
         torch.save({
             'state_dict': self.model.state_dict(),
             'optim_dict': self.optimizer.state_dict(),
@@ -249,10 +247,10 @@ class Trainer(object):
                 epoch_meters.batch_time.update(time.time() - start_batch)
 
                 if i % int(self.args.log_freq) == 0 or i == len(self.train_loader) - 1:
-                    prec1, prec5 = accuracy(output.detach(), target, topk=(1, 5))
+                    correct1, correct5 = correct_topk(output.detach(), target, topk=(1, 5))
                     epoch_meters.losses.update(loss.item(), input.size(0))
-                    epoch_meters.top1.update(prec1.item(), input.size(0))
-                    epoch_meters.top5.update(prec5.item(), input.size(0))
+                    epoch_meters.top1.update(correct1, input.size(0))
+                    epoch_meters.top5.update(correct5, input.size(0))
                     self.logger.training_batch_cli_log(epoch_meters, epoch, i,
                                                        len(self.train_loader))
 
@@ -278,6 +276,9 @@ class Trainer(object):
             elif not self.args.dry_run:
                 self.checkpoint_best(epoch, "checkpoint.tar")
 
+            # write out buffered logs
+            self.logger.flush()
+
         # training ends
         if not self.args.dry_run:
             return os.path.join(self.checkpoints_dir_path, "best.tar")
@@ -321,15 +322,15 @@ class Trainer(object):
             eval_meters.loss_time.update(time.time() - end)
 
             pred = output.data.argmax(1, keepdim=True)
-            correct = pred.eq(target.data.view_as(pred)).sum()
-            prec1 = 100. * correct.float() / input.size(0)
+            correct1 = pred.eq(target.data.view_as(pred)).sum()
 
-            _, prec5 = accuracy(output, target, topk=(1, 5))
+            correct5, = correct_topk(output, target, topk=(5,))
             eval_meters.losses.update(loss.item(), input.size(0))
-            eval_meters.top1.update(prec1.item(), input.size(0))
-            eval_meters.top5.update(prec5.item(), input.size(0))
+            eval_meters.top1.update(correct1, input.size(0))
+            eval_meters.top5.update(correct5, input.size(0))
 
             # Eval batch ends
             self.logger.eval_batch_cli_log(eval_meters, i, len(self.test_loader))
 
+        self.logger.flush()
         return eval_meters.top1.avg
@@ -7,7 +7,8 @@ import pytest_cases
 from hypothesis import given
 
 import torch
-from brevitas.core.bit_width import BitWidthParameter
+from brevitas.core.bit_width import BitWidthParameter, RemoveBitwidthParameter
+from brevitas.core.bit_width.parameter import MIN_INT_BIT_WIDTH, NON_ZERO_EPSILON
 from brevitas.core.restrict_val import IntRestrictValue
 from brevitas.core.function_wrapper import RoundSte
 from brevitas import config
@@ -40,6 +41,11 @@ class TestBitWidthParameterDefaults:
         bit_width_module = bit_width_parameter_defaults
         assert isinstance(bit_width_module.restrict_bit_width_impl, IntRestrictValue)
 
+    def test_default_restrict_bit_width_impl_shared(self, bit_width_parameter_defaults):
+        bit_width_module = bit_width_parameter_defaults
+        other_restrict_impl = BitWidthParameter(MIN_INT_BIT_WIDTH).restrict_bit_width_impl
+        assert bit_width_module.restrict_bit_width_impl is other_restrict_impl
+
     def test_default_float_to_int_impl(self, bit_width_parameter_defaults):
         bit_width_module = bit_width_parameter_defaults
         assert isinstance(bit_width_module.restrict_bit_width_impl.float_to_int_impl, RoundSte)
@@ -87,9 +93,27 @@ class TestBitWidthParameter:
         assert_allclose(bit_width_parameter.bit_width_offset.grad, bit_width_grad)
         self.clean_up_bwd(bit_width_parameter)
 
+    @pytest.mark.parametrize('use_sign_grad', [True, False])
+    def test_bwd_zero_offset(self, use_sign_grad):
+        """
+        Test the subgradient w.r.t. bit_width_offset == 0 with and without binary-sign gradient
+        """
+        bit_width_parameter = BitWidthParameter(4, min_bit_width=4, use_sign_grad=use_sign_grad)
+        bit_width_tensor = bit_width_parameter()
+        bit_width_tensor.backward()
+        assert bit_width_tensor == 4
+        assert bit_width_parameter.bit_width_offset.grad == (1. if use_sign_grad else 0.)
+
     def test_bit_width_base(self, bit_width_parameter, min_bit_width_init):
         assert bit_width_parameter.bit_width_base == min_bit_width_init
 
+    def test_bit_width_base_not_in_state_dict(self, bit_width_parameter):
+        """
+        Test that bit_width_base is a buffer that is not stored in a state dict
+        """
+        assert 'bit_width_base' in dict(bit_width_parameter.named_buffers())
+        assert 'bit_width_base' not in bit_width_parameter.state_dict()
+
     def test_bit_width_offset(
             self, bit_width_parameter: BitWidthParameter, bit_width_init, min_bit_width_init):
         """
@@ -124,3 +148,145 @@ class TestBitWidthParameter:
             assert value == override_value
         else:
             assert value == state_dict_value
+
+    @pytest.mark.skipif(config.JIT_ENABLED, reason='Caching is disabled when compiled')
+    def test_inference_cache(self, bit_width_parameter):
+        """
+        Test that the output is cached in inference and invalidated by in-place updates
+        """
+        bit_width_parameter.eval()
+        with torch.no_grad():
+            bit_width = bit_width_parameter()
+            assert bit_width_parameter() is bit_width
+            bit_width_parameter.bit_width_offset.add_(1)
+            assert bit_width_parameter() == bit_width + 1
+
+    @pytest.mark.skipif(config.JIT_ENABLED, reason='Caching is disabled when compiled')
+    def test_inference_cache_swapped_storage(self, bit_width_parameter, bit_width_init):
+        """
+        Test that the cache is invalidated when the storage of the offset is swapped, which doesn't
+        bump its version counter
+        """
+        bit_width_parameter.eval()
+        with torch.no_grad():
+            offset = bit_width_parameter.bit_width_offset.item()
+            assert bit_width_parameter() == bit_width_init
+            bit_width_parameter.bit_width_offset.data = torch.tensor(offset + 1)
+            assert bit_width_parameter() == bit_width_init + 1
+            torch.nn.utils.vector_to_parameters(
+                torch.tensor([offset + 2]), bit_width_parameter.parameters())
+            assert bit_width_parameter() == bit_width_init + 2
+            bit_width_parameter.bit_width_offset = torch.nn.Parameter(torch.tensor(offset + 3))
+            assert bit_width_parameter() == bit_width_init + 3
+
+    def test_no_grad(self, bit_width_parameter, bit_width_init):
+        """
+        Test that the output with gradients disabled matches the differentiable one
+        """
+        with torch.no_grad():
+            bit_width = bit_width_parameter()
+        assert bit_width.grad_fn is None
+        assert bit_width == bit_width_init
+        assert bit_width == bit_width_parameter()
+
+    def test_no_cache_in_training(self, bit_width_parameter):
+        bit_width_parameter.train()
+        assert bit_width_parameter() is not bit_width_parameter()
+
+    def test_scalar(self, bit_width_parameter, bit_width_init):
+        """
+        Test that scalar() returns the output as a Python float that tracks in-place updates
+        """
+        bit_width = bit_width_parameter.scalar()
+        assert isinstance(bit_width, float)
+        assert bit_width == bit_width_init
+        with torch.no_grad():
+            bit_width_parameter.bit_width_offset.add_(1)
+        assert bit_width_parameter.scalar() == bit_width_init + 1
+
+    def test_scalar_swapped_storage(self, bit_width_parameter, bit_width_init):
+        """
+        Test that scalar() tracks swaps of the storage of the offset, which don't bump its version
+        counter
+        """
+        offset = bit_width_parameter.bit_width_offset.item()
+        assert bit_width_parameter.scalar() == bit_width_init
+        bit_width_parameter.bit_width_offset.data = torch.tensor(offset + 1)
+        assert bit_width_parameter.scalar() == bit_width_init + 1
+        torch.nn.utils.vector_to_parameters(
+            torch.tensor([offset + 2]), bit_width_parameter.parameters())
+        assert bit_width_parameter.scalar() == bit_width_init + 2
+
+    def test_detached_to(self, bit_width_parameter, bit_width_init):
+        bit_width = bit_width_parameter.detached_to(torch.device('cpu'))
+        assert not bit_width.requires_grad
+        assert bit_width == bit_width_init
+        if not config.JIT_ENABLED:
+            assert bit_width_parameter.detached_to('cpu') is bit_width
+        with torch.no_grad():
+            bit_width_parameter.bit_width_offset.add_(1)
+        assert bit_width_parameter.detached_to('cpu') == bit_width_init + 1
+
+    @pytest.mark.parametrize('dtype', [torch.float64, torch.bfloat16])
+    def test_dtype(self, bit_width_init, dtype):
+        bit_width_parameter = BitWidthParameter(bit_width_init, dtype=dtype)
+        bit_width = bit_width_parameter()
+        assert bit_width.dtype == dtype
+        assert bit_width_parameter.bit_width_base.dtype == dtype
+        assert bit_width == bit_width_init
+        bit_width.backward()
+        assert bit_width_parameter.bit_width_offset.grad.dtype == dtype
+
+
+class TestRemoveBitwidthParameter:
+
+    @pytest.mark.parametrize('bit_width_to_remove', [0, 1, 4])
+    def test_fwd_bwd(self, bit_width_to_remove):
+        remove_bit_width = RemoveBitwidthParameter(bit_width_to_remove)
+        coeff = remove_bit_width.bit_width_coeff.detach().clone().requires_grad_(True)
+        reference = 1 / (NON_ZERO_EPSILON + torch.abs(coeff))
+        reference.backward()
+        output = remove_bit_width()
+        output.backward()
+        assert_allclose(output, reference)
+        assert_allclose(remove_bit_width.bit_width_coeff.grad, coeff.grad)
+
+    def test_epsilon_not_in_state_dict(self):
+        remove_bit_width = RemoveBitwidthParameter(2)
+        state_dict = remove_bit_width.state_dict()
+        assert list(state_dict.keys()) == ['bit_width_coeff']
+        with torch.no_grad():
+            remove_bit_width.bit_width_coeff.fill_(0.25)
+        remove_bit_width_loaded = RemoveBitwidthParameter(1)
+        remove_bit_width_loaded.load_state_dict(remove_bit_width.state_dict())
+        assert_allclose(remove_bit_width_loaded(), remove_bit_width())
+
+    @pytest.mark.skipif(config.JIT_ENABLED, reason='Caching is disabled when compiled')
+    def test_inference_cache(self):
+        remove_bit_width = RemoveBitwidthParameter(2)
+        remove_bit_width.eval()
+        with torch.no_grad():
+            bit_width = remove_bit_width()
+            assert remove_bit_width() is bit_width
+            remove_bit_width.bit_width_coeff.fill_(0.25)
+            assert_allclose(remove_bit_width(), 1 / (torch.tensor(0.25) + NON_ZERO_EPSILON))
+            remove_bit_width.bit_width_coeff.data = torch.tensor(0.125)
+            assert_allclose(remove_bit_width(), 1 / (torch.tensor(0.125) + NON_ZERO_EPSILON))
+
+    def test_scalar(self):
+        remove_bit_width = RemoveBitwidthParameter(2)
+        bit_width = remove_bit_width.scalar()
+        assert isinstance(bit_width, float)
+        assert bit_width == pytest.approx(1 / (0.5 + NON_ZERO_EPSILON))
+        with torch.no_grad():
+            remove_bit_width.bit_width_coeff.fill_(0.25)
+        assert remove_bit_width.scalar() == pytest.approx(1 / (0.25 + NON_ZERO_EPSILON))
+
+    @pytest.mark.parametrize('dtype', [torch.float64, torch.bfloat16])
+    def test_dtype(self, dtype):
+        remove_bit_width = RemoveBitwidthParameter(2, dtype=dtype)
+        bit_width = remove_bit_width()
+        assert bit_width.dtype == dtype
+        assert remove_bit_width.non_zero_epsilon.dtype == dtype
+        bit_width.backward()
+        assert remove_bit_width.bit_width_coeff.grad.dtype == dtype
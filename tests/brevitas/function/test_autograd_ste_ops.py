@@ -190,8 +190,41 @@ class TestAbsBinarySignGrad:
         assert reference_output == 0.0
 
 
+class TestAbsAddRoundSte:
 
+    @given(inp=scalar_float_tensor_st(), other=scalar_float_tensor_st())
+    def test_fwd(self, inp, other):
+        """
+        Test that the forward pass matches torch.round(torch.abs(inp) + other)
+        """
+        import torch
 
+        output = abs_add_round_ste_impl(inp, other)
+        assert_allclose(output, torch.round(torch.abs(inp) + other))
 
+    @given(inp=scalar_float_nz_tensor_st(), grad=scalar_float_tensor_st())
+    def test_bwd_nz(self, inp, grad):
+        """
+        Test that the backward pass matches torch.abs backward for inp != 0
+        """
+        import torch
 
+        inp.requires_grad_(True)
+        output = abs_add_round_ste_impl(inp, tensor(2.0))
+        output.backward(grad)
+        reference_inp = inp.detach().clone().requires_grad_(True)
+        reference_output = torch.abs(reference_inp)
+        reference_output.backward(grad)
+        assert_allclose(inp.grad, reference_inp.grad)
+
+    @given(grad=scalar_float_tensor_st())
+    def test_bwd_zero(self, grad):
+        """
+        Test that the subgradient w.r.t. inp == 0 is 1 and not 0
+        """
+        inp = tensor(0.0)
+        inp.requires_grad_(True)
+        output = abs_add_round_ste_impl(inp, tensor(2.0))
+        output.backward(grad)
+        assert_allclose(inp.grad, grad)
 
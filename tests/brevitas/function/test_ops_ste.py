@@ -120,4 +120,22 @@ def test_scalar_clamp_min_ste_backend(prefix: str, x):
         # check that the wrapped function is called with the correct argument
         python_backend.assert_called_once_with(inp, min_val)
         # check that the return value of the wrapper is the return values of the wrapped function
-        assert return_val is mocked_return_val
\ No newline at end of file
+        assert return_val is mocked_return_val
+
+
+@given(x=two_float_tensor_random_shape_st())
+def test_abs_add_round_ste_backend(prefix: str, x):
+    """
+    Test that abs_add_round_ste is wrapping the backend implementation correctly.
+    """
+    backend_name = 'abs_add_round_ste_impl'
+    with mock.patch(prefix + backend_name) as python_backend:
+        inp, mocked_return_val = x
+        other = torch.tensor(2.0)
+        python_backend.return_value = mocked_return_val
+        return_val = abs_add_round_ste(inp, other)
+        # check that the wrapped function is called with the correct argument
+        python_backend.assert_called_once_with(inp, other)
+        # check that the return value of the wrapper is the return values of the wrapped function
+        assert return_val is mocked_return_val
+
@@ -0,0 +1,57 @@
+# Copyright (C) 2023, Advanced Micro Devices, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+
+import logging
+
+import pytest
+import torch
+
+from brevitas_examples.bnn_pynq.logger import AverageMeter, BufferedFileHandler
+from brevitas_examples.bnn_pynq.logger import IntAccuracyMeter, read_accuracies
+
+
+def test_average_meter_update_batch():
+    vals = [0.5, 1.25, 3.]
+    ns = [4, 2, 1]
+    meter = AverageMeter()
+    for val, n in zip(vals, ns):
+        meter.update(val, n)
+    batch_meter = AverageMeter()
+    batch_meter.update_batch(vals, ns)
+    assert batch_meter.val == meter.val
+    assert batch_meter.sum == pytest.approx(meter.sum)
+    assert batch_meter.count == meter.count
+    assert batch_meter.avg == pytest.approx(meter.avg)
+
+
+def test_average_meter_update_batch_empty():
+    meter = AverageMeter()
+    meter.update(2., 3)
+    meter.update_batch([], [])
+    assert meter.val == 2.
+    assert meter.count == 3
+    assert meter.avg == 2.
+
+
+@pytest.mark.parametrize('delay', [False, True])
+def test_buffered_file_handler(tmp_path, delay):
+    path = tmp_path / 'log.txt'
+    handler = BufferedFileHandler(str(path), delay=delay)
+    assert path.exists() != delay
+    handler.emit(logging.makeLogRecord({'msg': 'Prec@1 %.3f', 'args': (99.5,)}))
+    handler.close()
+    handler.close()
+    handler.flush()
+    assert path.read_text(encoding='utf-8') == 'Prec@1 99.500\n'
+
+
+def test_read_accuracies():
+    top1 = IntAccuracyMeter()
+    top5 = IntAccuracyMeter()
+    assert read_accuracies(top1, top5) == [0., 0., 0., 0.]
+    for correct1, correct5, n in [(3, 7, 8), (5, 6, 6)]:
+        top1.update(torch.tensor(correct1), n)
+        top5.update(torch.tensor(correct5), n)
+    assert read_accuracies(top1, top5) == [top1.val, top1.avg, top5.val, top5.avg]
+    assert read_accuracies(top1) == [100. * 5 / 6, 100. * 8 / 14]